@@ -0,0 +1,105 @@
+"""
+Benchmark for client-subnet routing rules
+
+Usage:
+    python bench/routing_bench.py [--prefixes 1000000] [--lookups 200000]
+
+Reports table build time, lookup latency and how long the event loop
+stalls while the rules are reloaded from CSV in a worker thread.
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.app.routing import ClientRouter, RoutingRule, RoutingTable
+
+
+def random_prefixes(count: int, rng: random.Random):
+    for _ in range(count):
+        if rng.random() < 0.9:
+            length = rng.randint(8, 32)
+            address = ipaddress.IPv4Address(rng.getrandbits(32))
+        else:
+            length = rng.randint(16, 64)
+            address = ipaddress.IPv6Address(rng.getrandbits(128))
+        yield f"{address}/{length}"
+
+
+def bench_build(prefixes) -> RoutingTable:
+    rule = RoutingRule(target="cdn")
+    started = time.perf_counter()
+    table = RoutingTable((prefix, rule) for prefix in prefixes)
+    print(f"build:   {len(prefixes)} prefixes in {time.perf_counter() - started:.2f}s")
+    return table
+
+
+def bench_lookup(table: RoutingTable, count: int, rng: random.Random):
+    addresses = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(count)]
+    started = time.perf_counter()
+    for address in addresses:
+        table.lookup(address)
+    elapsed = time.perf_counter() - started
+    print(f"lookup:  {elapsed / count * 1e6:.2f}us per lookup ({count} lookups)")
+
+
+async def bench_reload(prefixes):
+    """Measure event loop tick delay while reload runs in a worker thread"""
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+        f.write("prefix,target,cdn_host\n")
+        for prefix in prefixes:
+            f.write(f"{prefix},cdn,\n")
+        path = f.name
+
+    router = ClientRouter(path)
+    delays = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            delays.append((time.perf_counter() - started - 0.001) * 1000)
+
+    try:
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        await router.reload()
+        elapsed = time.perf_counter() - started
+        done.set()
+        await task
+    finally:
+        os.unlink(path)
+
+    delays.sort()
+    print(
+        f"reload:  {elapsed:.2f}s, event loop delay "
+        f"median {statistics.median(delays):.2f}ms, "
+        f"p99 {delays[int(len(delays) * 0.99)]:.2f}ms, max {delays[-1]:.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--prefixes", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    prefixes = list(random_prefixes(args.prefixes, rng))
+
+    table = bench_build(prefixes)
+    bench_lookup(table, args.lookups, rng)
+    asyncio.run(bench_reload(prefixes))
+
+
+if __name__ == "__main__":
+    main()
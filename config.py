@@ -1,4 +1,5 @@
 from dotenv import load_dotenv
+import json
 import os
 
 
@@ -18,3 +19,20 @@ DATABASE_URL = os.getenv(
 CDN_HOST = os.getenv("CDN_HOST", "cdn.example.com")
 DEFAULT_CDN_RATIO = int(os.getenv("DEFAULT_CDN_RATIO", "9"))
 DEFAULT_ORIGIN_RATIO = int(os.getenv("DEFAULT_ORIGIN_RATIO", "1"))
+
+ROUTING_RULES_PATH = os.getenv("ROUTING_RULES_PATH")
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "20"))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "40"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_REDIS_SYNC = os.getenv("RATE_LIMIT_REDIS_SYNC", "false").lower() == "true"
+RATE_LIMIT_SYNC_INTERVAL = float(os.getenv("RATE_LIMIT_SYNC_INTERVAL", "1"))
+
+# JSON overrides per content class, e.g. {"manifest": {"cdn_ratio": 5, "origin_ratio": 5}}
+CONTENT_POLICIES = json.loads(os.getenv("CONTENT_POLICIES") or "{}")
+
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", "0.1"))
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "0.5"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "5"))
@@ -1,9 +1,12 @@
 from ..database import get_db
 from ..r_cache import get_redis_client
 from ..schemas import BalancerRequest, BalancerResponse
-from src.app.balancer import video_balancer
+from src.app.balancer import db_breaker, redis_breaker, video_balancer
+from src.app.content import content_policies
+from src.app.rate_limit import rate_limiter
+from src.app.routing import client_router
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,8 +17,11 @@ logger = logging.getLogger(__name__)
 router = APIRouter(tags=["balancer"])
 
 
-@router.get("/", response_class=RedirectResponse)
+@router.get(
+    "/", response_class=RedirectResponse, dependencies=[Depends(rate_limiter)]
+)
 async def balance_video_request(
+    request: Request,
     video: str = Query(..., description="Video URL to balance"),
     db: AsyncSession = Depends(get_db),
     redis_cache=Depends(get_redis_client),
@@ -27,21 +33,43 @@ async def balance_video_request(
         GET /?video=http://s1.origin-cluster/video/1488/xcg2djHckad.m3u8
     """
 
-    redirect_url, target = await video_balancer.balance_request(video, db, redis_cache)
+    client_ip = request.client.host if request.client else None
+    redirect_url, target, content_class = await video_balancer.balance_request(
+        video, db, redis_cache, client_ip
+    )
+
+    policy = content_policies[content_class]
+    headers = {
+        "X-Target": target,
+        "X-Content-Class": content_class,
+        "X-Original-URL": video,
+    }
+    if policy.cache_control:
+        headers["Cache-Control"] = policy.cache_control
 
     return RedirectResponse(
         url=redirect_url,
-        status_code=301,
-        headers={"X-Target": target, "X-Original-URL": video},
+        status_code=policy.redirect_status,
+        headers=headers,
     )
 
 
-@router.post("/balance", response_model=BalancerResponse)
+@router.post(
+    "/balance", response_model=BalancerResponse, dependencies=[Depends(rate_limiter)]
+)
 async def balance_video_request_json(
-    request: BalancerRequest, db: AsyncSession = Depends(get_db)
+    request: BalancerRequest,
+    raw_request: Request,
+    db: AsyncSession = Depends(get_db),
+    redis_cache=Depends(get_redis_client),
 ):
-    redirect_url, target = await video_balancer.balance_request(request.video, db)
-    return BalancerResponse(redirect_url=redirect_url, target=target)
+    client_ip = raw_request.client.host if raw_request.client else None
+    redirect_url, target, content_class = await video_balancer.balance_request(
+        request.video, db, redis_cache, client_ip
+    )
+    return BalancerResponse(
+        redirect_url=redirect_url, target=target, content_class=content_class
+    )
 
 
 @router.get("/stats")
@@ -51,6 +79,13 @@ async def get_balancer_stats():
     """
     stats = {
         "request_counter": video_balancer.request_counter,
+        "content_classes": video_balancer.class_stats,
+        "routing_rules": client_router.size,
+        "rate_limit": rate_limiter.stats(),
+        "dependencies": {
+            "redis": redis_breaker.stats(),
+            "database": db_breaker.stats(),
+        },
         "balancer_status": "active",
     }
     return stats
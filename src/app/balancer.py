@@ -1,5 +1,14 @@
-from config import CDN_HOST, DEFAULT_CDN_RATIO, DEFAULT_ORIGIN_RATIO
+from config import (
+    CDN_HOST,
+    DB_TIMEOUT,
+    DEFAULT_CDN_RATIO,
+    DEFAULT_ORIGIN_RATIO,
+    REDIS_TIMEOUT,
+)
+from src.app.breaker import CircuitBreaker, CircuitOpenError
+from src.app.content import CONTENT_CLASSES, OTHER, classify_content, content_policies
 from src.app.crud import balancer_config_crud
+from src.app.routing import client_router
 from src.app.schemas import BalancerConfigUpdate
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,16 +18,32 @@ from urllib.parse import urlparse
 import logging
 import re
 import json
+import time
 
 
 logger = logging.getLogger(__name__)
 
+_SERVER_RE = re.compile(r"^([a-zA-Z0-9]+)\.")
+_VIDEO_PATH_RE = re.compile(r"^/video/\d+/[a-zA-Z0-9_-]")
+
+CONFIG_CACHE_TTL = 300
+
+redis_breaker = CircuitBreaker("redis", REDIS_TIMEOUT)
+db_breaker = CircuitBreaker("database", DB_TIMEOUT)
+
 
 class VideoBalancer:
     """Video request balancer that routes requests to CDN or origin servers"""
 
     def __init__(self):
         self.request_counter = 0
+        self.last_config: BalancerConfigUpdate | None = None
+        self.db_refreshed_at = 0.0
+        self.class_counters = dict.fromkeys(CONTENT_CLASSES, 0)
+        self.class_stats = {
+            content_class: {"cdn": 0, "origin": 0}
+            for content_class in CONTENT_CLASSES
+        }
 
     def _parse_video_url(self, video_url: str) -> Tuple[str, str, str]:
         """
@@ -36,7 +61,7 @@ class VideoBalancer:
             if not hostname:
                 raise ValueError("Invalid hostname in URL")
 
-            server_match = re.match(r"^([a-zA-Z0-9]+)\.", hostname)
+            server_match = _SERVER_RE.match(hostname)
             if not server_match:
                 raise ValueError(f"Invalid server format in hostname: {hostname}")
 
@@ -46,7 +71,7 @@ class VideoBalancer:
             if not path or not path.startswith("/"):
                 raise ValueError("Invalid path format")
 
-            if not re.match(r"^/video/\d+/[a-zA-Z0-9_-]", path):
+            if not _VIDEO_PATH_RE.match(path):
                 raise ValueError("Path does not match expected video format")
 
             return server, path, hostname
@@ -61,22 +86,27 @@ class VideoBalancer:
         """
         return f"http://{cdn_host}/{server}{path}"
 
-    def _should_use_origin(self, cdn_ratio: int, origin_ratio: int) -> bool:
+    def _should_use_origin(
+        self, cdn_ratio: int, origin_ratio: int, content_class: str = OTHER
+    ) -> bool:
         """
         Determine if request should go to origin based on ratios
-        Uses simple round-robin approach for better distribution
+        Uses simple round-robin approach for better distribution,
+        with a separate counter per content class
         """
         total_ratio = cdn_ratio + origin_ratio
         self.request_counter += 1
+        self.class_counters[content_class] += 1
 
-        return (self.request_counter % total_ratio) < origin_ratio
+        return (self.class_counters[content_class] % total_ratio) < origin_ratio
 
     async def balance_request(
         self,
         video_url: str,
         db: AsyncSession,
         redis_cache,
-    ) -> Tuple[str, str]:
+        client_ip: str | None = None,
+    ) -> Tuple[str, str, str]:
         """
         Balance video request between CDN and origin
 
@@ -84,13 +114,37 @@ class VideoBalancer:
             video_url: Original video URL
             db: Database session
             redis_cache: Cache
+            client_ip: Client address used for subnet routing rules
 
         Returns:
-            Tuple of (redirect_url, target_type)
+            Tuple of (redirect_url, target_type, content_class)
         """
         server, path, _ = self._parse_video_url(video_url)
+        content_class = classify_content(path)
+
+        redirect_url, target = await self._route(
+            video_url, server, path, content_class, db, redis_cache, client_ip
+        )
+        self.class_stats[content_class][target] += 1
+
+        return redirect_url, target, content_class
 
+    async def _route(
+        self,
+        video_url: str,
+        server: str,
+        path: str,
+        content_class: str,
+        db: AsyncSession,
+        redis_cache,
+        client_ip: str | None,
+    ) -> Tuple[str, str]:
         try:
+            rule = client_router.lookup(client_ip)
+            if rule and rule.target == "origin":
+                return video_url, "origin"
+            if rule and rule.cdn_host:
+                return self._generate_cdn_url(server, path, rule.cdn_host), "cdn"
 
             config = await self._get_conf(db, redis_cache)
 
@@ -103,7 +157,18 @@ class VideoBalancer:
                 cdn_ratio = DEFAULT_CDN_RATIO
                 origin_ratio = DEFAULT_ORIGIN_RATIO
 
-            if self._should_use_origin(cdn_ratio, origin_ratio):
+            policy = content_policies[content_class]
+            if policy.cdn_host:
+                cdn_host = policy.cdn_host
+            if policy.cdn_ratio:
+                cdn_ratio = policy.cdn_ratio
+            if policy.origin_ratio:
+                origin_ratio = policy.origin_ratio
+
+            if rule:
+                return self._generate_cdn_url(server, path, cdn_host), "cdn"
+
+            if self._should_use_origin(cdn_ratio, origin_ratio, content_class):
                 return video_url, "origin"
             else:
                 cdn_url = self._generate_cdn_url(server, path, cdn_host)
@@ -116,26 +181,66 @@ class VideoBalancer:
             return video_url, "origin"
 
     async def _get_conf(self, db, cache):
+        """
+        Get active config from Redis, then DB. Each dependency is called
+        through its circuit breaker, so a slow or failing one is skipped
+        and the last known config is served instead. While Redis is down
+        the DB is asked for a fresh config at most once per cache TTL
+        """
         try:
-            if cached_config := await cache.get("balancer_config"):
+            if cached_config := await redis_breaker.call(
+                cache.get, "balancer_config"
+            ):
                 cached = json.loads(cached_config)
                 logger.info("Cached ok %s", cached)
-                return BalancerConfigUpdate(**cached)
+                self.last_config = BalancerConfigUpdate(**cached)
+                return self.last_config
         except Exception as e:
-            logger.warning("Redis cache warning %s", e)
+            if isinstance(e, CircuitOpenError):
+                logger.debug("Redis cache skipped %s", e)
+            else:
+                logger.warning("Redis cache warning %s", e)
+            if (
+                self.last_config is not None
+                and time.monotonic() - self.db_refreshed_at < CONFIG_CACHE_TTL
+            ):
+                return self.last_config
+            self.db_refreshed_at = time.monotonic()
 
-        if config := await balancer_config_crud.get_active_config(db):
+        try:
+            config = await db_breaker.call(balancer_config_crud.get_active_config, db)
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                await self._invalidate_session(db)
+            if self.last_config is None:
+                raise
+            if isinstance(e, CircuitOpenError):
+                logger.debug("Database skipped %s, using last known config", e)
+            else:
+                logger.warning("Database warning %s, using last known config", e)
+            return self.last_config
+
+        if config:
+            config_dict = {
+                "cdn_host": config.cdn_host,
+                "cdn_ratio": config.cdn_ratio,
+                "origin_ratio": config.origin_ratio,
+                "is_active": config.is_active,
+            }
+            self.last_config = BalancerConfigUpdate(**config_dict)
+            self.db_refreshed_at = time.monotonic()
             try:
-                config_dict = {
-                    "cdn_host": config.cdn_host,
-                    "cdn_ratio": config.cdn_ratio,
-                    "origin_ratio": config.origin_ratio,
-                    "is_active": config.is_active,
-                }
-                await cache.setex("balancer_config", 300, json.dumps(config_dict))
+                await redis_breaker.call(
+                    cache.setex,
+                    "balancer_config",
+                    CONFIG_CACHE_TTL,
+                    json.dumps(config_dict),
+                )
+            except CircuitOpenError:
+                pass
             except Exception as e:
                 logger.warning(f"Failed to set Redis cache: {e}")
-            return config
+            return self.last_config
 
         return BalancerConfigUpdate(
             cdn_host=CDN_HOST,
@@ -144,9 +249,22 @@ class VideoBalancer:
             is_active=True,
         )
 
+    async def _invalidate_session(self, db: AsyncSession):
+        """
+        Drop the session connection after a cancelled query, so it is not
+        returned to the pool in an unknown state
+        """
+        try:
+            await db.invalidate()
+        except Exception as e:
+            logger.warning(f"Failed to invalidate database session: {e}")
+
     def reset_counter(self):
-        """Reset request counter (useful for testing)"""
+        """Reset request counters (useful for testing)"""
         self.request_counter = 0
+        for content_class in CONTENT_CLASSES:
+            self.class_counters[content_class] = 0
+            self.class_stats[content_class] = {"cdn": 0, "origin": 0}
 
 
 video_balancer = VideoBalancer()
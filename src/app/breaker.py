@@ -0,0 +1,81 @@
+from config import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT
+
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is skipped because the breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Timeout and circuit breaker around an async dependency.
+    After failure_threshold consecutive failures calls are skipped for
+    reset_timeout seconds, then a single trial call is let through
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_running = False
+        self.skipped = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        state = self.state
+        if state == "open" or (state == "half-open" and self.trial_running):
+            self.skipped += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        self.trial_running = state == "half-open"
+        try:
+            result = await asyncio.wait_for(func(*args), self.timeout)
+        except TimeoutError as e:
+            self._on_failure()
+            raise TimeoutError(
+                f"{self.name} call timed out after {self.timeout}s"
+            ) from e
+        except Exception:
+            self._on_failure()
+            raise
+        finally:
+            self.trial_running = False
+
+        if self.opened_at is not None:
+            logger.info("%s circuit closed", self.name)
+        self.failures = 0
+        self.opened_at = None
+        return result
+
+    def _on_failure(self):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("%s circuit opened", self.name)
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "skipped": self.skipped}
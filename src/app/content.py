@@ -0,0 +1,62 @@
+from config import CONTENT_POLICIES
+from src.app.schemas import ContentPolicy
+
+from typing import Dict
+import re
+
+
+MANIFEST = "manifest"
+INIT = "init"
+SEGMENT = "segment"
+OTHER = "other"
+
+CONTENT_CLASSES = (MANIFEST, INIT, SEGMENT, OTHER)
+
+_EXTENSIONS: Dict[str, str] = {
+    "m3u8": MANIFEST,
+    "mpd": MANIFEST,
+    "ts": SEGMENT,
+    "m4s": SEGMENT,
+    "m4v": SEGMENT,
+    "m4a": SEGMENT,
+    "mp4": SEGMENT,
+    "aac": SEGMENT,
+    "vtt": SEGMENT,
+}
+
+# init segments: init.mp4, init-v1.m4s, video_init.mp4
+_INIT_RE = re.compile(r"(?:^|[_.-])init(?:[_.-]|$)", re.IGNORECASE)
+
+_DEFAULT_POLICIES: Dict[str, dict] = {
+    MANIFEST: {"redirect_status": 302, "cache_control": "no-cache"},
+    INIT: {"cache_control": "public, max-age=86400"},
+    SEGMENT: {"cache_control": "public, max-age=86400, immutable"},
+    OTHER: {},
+}
+
+
+def classify_content(path: str) -> str:
+    """Classify requested file by extension and name pattern"""
+    stem, sep, ext = path.rpartition("/")[2].rpartition(".")
+    if not sep:
+        return OTHER
+    content_class = _EXTENSIONS.get(ext.lower(), OTHER)
+    if content_class == SEGMENT and _INIT_RE.search(stem):
+        return INIT
+    return content_class
+
+
+def _build_policies() -> Dict[str, ContentPolicy]:
+    unknown = set(CONTENT_POLICIES) - set(CONTENT_CLASSES)
+    if unknown:
+        raise ValueError(f"Unknown content classes in CONTENT_POLICIES: {unknown}")
+
+    return {
+        content_class: ContentPolicy(
+            **{**defaults, **CONTENT_POLICIES.get(content_class, {})}
+        )
+        for content_class, defaults in _DEFAULT_POLICIES.items()
+    }
+
+
+content_policies = _build_policies()
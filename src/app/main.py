@@ -1,7 +1,10 @@
-from config import SENTRY_DSN
+from config import RATE_LIMIT_REDIS_SYNC, SENTRY_DSN
 from src.app.database import engine, Base
 from src.app.api import balancer
-from src.app.srv import config
+from src.app.r_cache import create_redis_client
+from src.app.rate_limit import rate_limiter
+from src.app.routing import client_router
+from src.app.srv import config, routing
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
@@ -11,7 +14,8 @@ from sentry_sdk.integrations.logging import LoggingIntegration
 import sentry_sdk
 
 import logging.config
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import sys
 import os
 
@@ -50,8 +54,25 @@ async def lifespan(app: FastAPI):
             "   The application will continue but database features may not work"
         )
 
+    try:
+        if client_router.path:
+            await client_router.reload()
+    except Exception as e:
+        logger.warning(f"⚠️  Warning: Could not load routing rules: {e}")
+
+    sync_task = None
+    if RATE_LIMIT_REDIS_SYNC and rate_limiter.enabled:
+        sync_redis = create_redis_client()
+        sync_task = asyncio.create_task(rate_limiter.run_sync(sync_redis))
+
     yield
 
+    if sync_task:
+        sync_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await sync_task
+        await sync_redis.close()
+
     await engine.dispose()
     logger.info("✅ Database connections closed")
 
@@ -73,6 +94,7 @@ app.add_middleware(
 
 app.include_router(balancer.router)
 app.include_router(config.router)
+app.include_router(routing.router)
 
 
 @app.exception_handler(ValueError)
@@ -96,6 +118,7 @@ async def root():
         "endpoints": {
             "balancer": "/?video=<video_url>",
             "config_api": "/api/config/",
+            "routing_api": "/srv/routing/",
             "docs": "/docs",
         },
     }
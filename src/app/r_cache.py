@@ -1,10 +1,21 @@
-from config import REDIS_CACHE_DB, REDIS_HOST, REDIS_PORT
+from config import REDIS_CACHE_DB, REDIS_HOST, REDIS_PORT, REDIS_TIMEOUT
 from redis import asyncio as aioredis
 
 
+def create_redis_client(host: str = REDIS_HOST, port: int = REDIS_PORT):
+    """Create Redis client with bounded socket timeouts"""
+    return aioredis.Redis(
+        host=host,
+        port=port,
+        db=REDIS_CACHE_DB,
+        socket_timeout=REDIS_TIMEOUT,
+        socket_connect_timeout=REDIS_TIMEOUT,
+    )
+
+
 async def get_redis_client():
 
-    redis_client = aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_CACHE_DB)
+    redis_client = create_redis_client()
     try:
         yield redis_client
     finally:
@@ -0,0 +1,173 @@
+from config import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_RPS,
+    RATE_LIMIT_SYNC_INTERVAL,
+)
+
+from fastapi import HTTPException, Request, status
+
+from collections import OrderedDict
+from typing import Dict, Tuple
+import asyncio
+import logging
+import math
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class GCRALimiter:
+    """
+    In-memory GCRA (generic cell rate algorithm) limiter with a bounded key
+    table. Least recently seen keys are evicted when the table is full.
+    Times are integer nanoseconds, so a full burst is never cut short by
+    float rounding
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int):
+        self.emission = round(1_000_000_000 / rate)
+        self.tolerance = self.emission * burst
+        self.max_keys = max_keys
+        self._tat: "OrderedDict[str, int]" = OrderedDict()
+        self._hits: Dict[str, int] = {}
+        self._blocked: Dict[str, int] = {}
+        self.allowed = 0
+        self.rejected = 0
+
+    def hit(self, key: str, now: int | None = None) -> float:
+        """
+        Register a request for key
+
+        Args:
+            key: Client key
+            now: Monotonic time in nanoseconds
+
+        Returns:
+            0 if allowed, otherwise seconds to wait before retrying
+        """
+        now = time.monotonic_ns() if now is None else now
+
+        blocked_until = self._blocked.get(key)
+        if blocked_until is not None:
+            if blocked_until > now:
+                self.rejected += 1
+                return (blocked_until - now) / 1_000_000_000
+            del self._blocked[key]
+
+        tat = max(self._tat.get(key, now), now) + self.emission
+        if tat - now > self.tolerance:
+            self.rejected += 1
+            return (tat - now - self.tolerance) / 1_000_000_000
+
+        self._tat[key] = tat
+        self._tat.move_to_end(key)
+        if len(self._tat) > self.max_keys:
+            evicted, _ = self._tat.popitem(last=False)
+            self._hits.pop(evicted, None)
+
+        self._hits[key] = self._hits.get(key, 0) + 1
+        self.allowed += 1
+        return 0.0
+
+    def drain_hits(self) -> Dict[str, int]:
+        """Return and reset per-key allowed hits since the last drain"""
+        hits, self._hits = self._hits, {}
+        return hits
+
+    def block(self, key: str, until: int) -> None:
+        """Reject key until the given monotonic time in nanoseconds"""
+        if len(self._blocked) >= self.max_keys:
+            self._blocked.clear()
+        self._blocked[key] = until
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "keys": len(self._tat),
+        }
+
+
+class RateLimiter:
+    """Per-client-IP and per-token rate limiting for balancer routes"""
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_RPS,
+        burst: int = RATE_LIMIT_BURST,
+        max_keys: int = RATE_LIMIT_MAX_KEYS,
+        enabled: bool = RATE_LIMIT_ENABLED,
+    ):
+        self.enabled = enabled
+        self.rate = rate
+        self.burst = burst
+        self.limiters = {
+            "ip": GCRALimiter(rate, burst, max_keys),
+            "token": GCRALimiter(rate, burst, max_keys),
+        }
+
+    def _keys(self, request: Request) -> Tuple[Tuple[str, str], ...]:
+        keys = []
+        if request.client:
+            keys.append(("ip", request.client.host))
+        if token := request.query_params.get("token"):
+            keys.append(("token", token))
+        return tuple(keys)
+
+    async def __call__(self, request: Request):
+        """Dependency rejecting over-limit clients with 429"""
+        if not self.enabled:
+            return
+
+        for kind, key in self._keys(request):
+            if retry_after := self.limiters[kind].hit(key):
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+    async def sync(self, redis_client, interval: float) -> None:
+        """
+        Push local hit counts to Redis and block keys whose cluster-wide
+        count in the current window exceeds rate * interval + burst, the most
+        a single client may pass through one instance. Approximate: limits
+        are enforced with up to one window of delay
+        """
+        window = int(time.time() // interval)
+        limit = self.rate * interval + self.burst
+
+        for kind, limiter in self.limiters.items():
+            hits = limiter.drain_hits()
+            if not hits:
+                continue
+
+            pipe = redis_client.pipeline(transaction=False)
+            for key, count in hits.items():
+                redis_key = f"rate_limit:{kind}:{key}:{window}"
+                pipe.incrby(redis_key, count)
+                pipe.expire(redis_key, math.ceil(interval * 2))
+            results = await pipe.execute()
+
+            blocked_until = time.monotonic_ns() + round(interval * 1_000_000_000)
+            for key, total in zip(hits, results[::2]):
+                if total > limit:
+                    limiter.block(key, blocked_until)
+
+    async def run_sync(self, redis_client, interval: float = RATE_LIMIT_SYNC_INTERVAL):
+        """Background loop for approximate cluster-wide limiting"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync(redis_client, interval)
+            except Exception as e:
+                logger.warning("Rate limit sync warning %s", e)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {kind: limiter.stats() for kind, limiter in self.limiters.items()}
+
+
+rate_limiter = RateLimiter()
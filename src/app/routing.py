@@ -0,0 +1,236 @@
+from config import ROUTING_RULES_PATH
+
+from typing import Dict, Iterable, NamedTuple, Tuple
+from array import array
+import asyncio
+import csv
+import ipaddress
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+TARGETS = ("cdn", "origin")
+
+_IPV4_MAPPED = ipaddress.IPv6Network("::ffff:0:0/96")
+
+
+class RoutingRule(NamedTuple):
+    """Routing decision for a client subnet"""
+
+    target: str
+    cdn_host: str | None = None
+
+
+class PrefixTrie:
+    """
+    Compressed (path-compressed binary) radix trie for longest-prefix match
+    over fixed-width integer keys, e.g. 32 bits for IPv4 and 128 for IPv6.
+
+    Nodes are stored in flat arrays indexed by node id (root is 0) rather
+    than as objects, so a table of millions of prefixes adds no GC-tracked
+    objects. Values must be hashable, equal values are stored once
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self.prefixes = array("Q") if width <= 64 else []
+        self.lengths = array("B")
+        self.children = array("q")
+        self.value_ids = array("q")
+        self.values = []
+        self._value_index = {}
+        self.size = 0
+        self._add_node(0, 0)
+
+    def _add_node(self, prefix: int, length: int, value_id: int = -1) -> int:
+        self.prefixes.append(prefix)
+        self.lengths.append(length)
+        self.children.extend((-1, -1))
+        self.value_ids.append(value_id)
+        return len(self.lengths) - 1
+
+    def _value_id(self, value) -> int:
+        value_id = self._value_index.get(value)
+        if value_id is None:
+            value_id = self._value_index[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def _set_value(self, node: int, value_id: int) -> None:
+        if self.value_ids[node] < 0:
+            self.size += 1
+        self.value_ids[node] = value_id
+
+    def _bit(self, key: int, position: int) -> int:
+        return (key >> (self.width - 1 - position)) & 1
+
+    def insert(self, prefix: int, length: int, value) -> None:
+        """Insert prefix/length, replacing the value of an existing prefix"""
+        width = self.width
+        prefix &= ((1 << length) - 1) << (width - length)
+        value_id = self._value_id(value)
+
+        node = 0
+        while True:
+            node_length = self.lengths[node]
+            if node_length == length:
+                self._set_value(node, value_id)
+                return
+
+            slot = 2 * node + self._bit(prefix, node_length)
+            child = self.children[slot]
+
+            if child < 0:
+                self.children[slot] = self._add_node(prefix, length, value_id)
+                self.size += 1
+                return
+
+            child_prefix = self.prefixes[child]
+            child_length = self.lengths[child]
+            common = min(
+                length, child_length, width - (prefix ^ child_prefix).bit_length()
+            )
+
+            if common == child_length:
+                node = child
+                continue
+
+            split = self._add_node(
+                prefix & (((1 << common) - 1) << (width - common)), common
+            )
+            self.children[2 * split + self._bit(child_prefix, common)] = child
+            if common == length:
+                self._set_value(split, value_id)
+            else:
+                self.children[2 * split + self._bit(prefix, common)] = self._add_node(
+                    prefix, length, value_id
+                )
+                self.size += 1
+            self.children[slot] = split
+            return
+
+    def lookup(self, key: int):
+        """Return the value of the longest prefix covering key, or None"""
+        width = self.width
+        prefixes = self.prefixes
+        lengths = self.lengths
+        children = self.children
+        value_ids = self.value_ids
+
+        node = 0
+        length = 0
+        best = value_ids[0]
+
+        while length < width:
+            child = children[2 * node + ((key >> (width - 1 - length)) & 1)]
+            if child < 0:
+                break
+            length = lengths[child]
+            if (key ^ prefixes[child]) >> (width - length):
+                break
+            if value_ids[child] >= 0:
+                best = value_ids[child]
+            node = child
+
+        return self.values[best] if best >= 0 else None
+
+
+class RoutingTable:
+    """Immutable set of client-subnet rules for IPv4 and IPv6"""
+
+    def __init__(self, rules: Iterable[Tuple[str, RoutingRule]] = ()):
+        self._tries: Dict[int, PrefixTrie] = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        for network, rule in rules:
+            self.add(network, rule)
+
+    @property
+    def size(self) -> int:
+        return sum(trie.size for trie in self._tries.values())
+
+    def add(self, network: str, rule: RoutingRule) -> None:
+        """
+        Add rule for network. IPv4-mapped IPv6 prefixes (::ffff:0:0/96 and
+        longer) are stored as IPv4, since mapped clients are looked up as IPv4
+        """
+        if rule.target not in TARGETS:
+            raise ValueError(f"Invalid routing target: {rule.target}")
+        net = ipaddress.ip_network(network.strip(), strict=False)
+        if net.version == 6 and net.subnet_of(_IPV4_MAPPED):
+            net = ipaddress.IPv4Network(
+                (net.network_address.ipv4_mapped, net.prefixlen - 96)
+            )
+        elif net.version == 6 and net.supernet_of(_IPV4_MAPPED):
+            raise ValueError(
+                f"Prefix {net} covers IPv4-mapped addresses, use IPv4 rules instead"
+            )
+        self._tries[net.version].insert(int(net.network_address), net.prefixlen, rule)
+
+    def lookup(self, client_ip: str) -> RoutingRule | None:
+        try:
+            address = ipaddress.ip_address(client_ip)
+        except ValueError:
+            return None
+
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+
+        return self._tries[address.version].lookup(int(address))
+
+    @classmethod
+    def from_csv(cls, path: str) -> "RoutingTable":
+        """
+        Load rules from CSV with header: prefix,target,cdn_host
+        Example row: 10.0.0.0/8,cdn,cdn2.example.com
+        """
+        table = cls()
+        with open(path, newline="") as f:
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                try:
+                    table.add(
+                        row["prefix"],
+                        RoutingRule(
+                            target=row["target"].strip(),
+                            cdn_host=(row.get("cdn_host") or "").strip() or None,
+                        ),
+                    )
+                except (KeyError, AttributeError, ValueError) as e:
+                    raise ValueError(
+                        f"Invalid routing rule at {path}:{line}: {e}"
+                    ) from e
+        return table
+
+
+class ClientRouter:
+    """Holds the active routing table and swaps it atomically on reload"""
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.table = RoutingTable()
+        self._reload_lock = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        return self.table.size
+
+    def lookup(self, client_ip: str | None) -> RoutingRule | None:
+        if not client_ip:
+            return None
+        return self.table.lookup(client_ip)
+
+    async def reload(self) -> int:
+        """
+        Build a new table in a worker thread and swap it in, so requests
+        keep using the previous table until the new one is fully loaded
+        """
+        if not self.path:
+            return self.size
+
+        async with self._reload_lock:
+            table = await asyncio.to_thread(RoutingTable.from_csv, self.path)
+            self.table = table
+        logger.info("Routing rules loaded: %s prefixes from %s", table.size, self.path)
+        return table.size
+
+
+client_router = ClientRouter(ROUTING_RULES_PATH)
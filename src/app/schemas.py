@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from typing import Literal
 
 
 class BalancerConfigBase(BaseModel):
@@ -42,3 +43,24 @@ class DelMessageResponse(BaseModel):
 class BalancerResponse(BaseModel):
     redirect_url: str = Field(..., description="URL to redirect to")
     target: str = Field(..., description="Target type: 'cdn' or 'origin'")
+    content_class: str = Field(
+        ..., description="Content class: 'manifest', 'init', 'segment' or 'other'"
+    )
+
+
+class ContentPolicy(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    cdn_host: str | None = Field(
+        None, description="CDN host for this class, active config if not set"
+    )
+    cdn_ratio: int | None = Field(None, ge=1, le=100, description="CDN ratio (1-100)")
+    origin_ratio: int | None = Field(
+        None, ge=1, le=100, description="Origin ratio (1-100)"
+    )
+    redirect_status: Literal[301, 302, 303, 307, 308] = Field(
+        301, description="Redirect status code"
+    )
+    cache_control: str | None = Field(
+        None, description="Cache-Control header for redirect response"
+    )
@@ -0,0 +1,32 @@
+import logging
+from fastapi import APIRouter, HTTPException, status
+from ..routing import client_router
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/srv/routing", tags=["routing"])
+
+
+@router.get("/")
+async def get_routing_info():
+    """Get loaded client-subnet routing rules info"""
+    return {"path": client_router.path, "prefixes": client_router.size}
+
+
+@router.post("/reload")
+async def reload_routing_rules():
+    """Reload client-subnet routing rules from file"""
+    if not client_router.path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ROUTING_RULES_PATH is not configured",
+        )
+    try:
+        prefixes = await client_router.reload()
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to reload routing rules: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to reload routing rules: {e}",
+        )
+    return {"path": client_router.path, "prefixes": prefixes}
@@ -0,0 +1,43 @@
+import pytest
+from pydantic import ValidationError
+
+from src.app.content import INIT, MANIFEST, OTHER, SEGMENT, classify_content
+from src.app.schemas import ContentPolicy
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/video/1488/xcg2djHckad.m3u8", MANIFEST),
+        ("/video/1488/manifest.mpd", MANIFEST),
+        ("/video/1488/INDEX.M3U8", MANIFEST),
+        ("/video/1488/init.mp4", INIT),
+        ("/video/1488/init-v1.m4s", INIT),
+        ("/video/1488/video_init.mp4", INIT),
+        ("/video/1488/Video_Init.MP4", INIT),
+        ("/video/1488/seg_12.ts", SEGMENT),
+        ("/video/1488/chunk-5.m4s", SEGMENT),
+        ("/video/1488/audio.aac", SEGMENT),
+        ("/video/1488/SEG_12.TS", SEGMENT),
+        ("/video/1488/initial.ts", SEGMENT),
+        ("/video/1488/uninit.ts", SEGMENT),
+        ("/video/1488/ts", OTHER),
+        ("/video/1488/mp4", OTHER),
+        ("/video/1488/init", OTHER),
+        ("/video/1488/poster.jpg", OTHER),
+        ("/video/1488/archive.", OTHER),
+    ],
+)
+def test_classify_content(path, expected):
+    assert classify_content(path) == expected
+
+
+def test_content_policy_rejects_unknown_field():
+    with pytest.raises(ValidationError):
+        ContentPolicy(cdn_ratios=5)
+
+
+@pytest.mark.parametrize("status", [200, 304, 404])
+def test_content_policy_rejects_non_redirect_status(status):
+    with pytest.raises(ValidationError):
+        ContentPolicy(redirect_status=status)
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.api import balancer as balancer_api
+from src.app.database import get_db
+from src.app.r_cache import get_redis_client
+from src.app.rate_limit import GCRALimiter, RateLimiter, rate_limiter
+
+
+SECOND = 1_000_000_000
+START = 1000 * SECOND
+
+
+def test_gcra_allows_full_burst():
+    limiter = GCRALimiter(rate=20, burst=40, max_keys=10)
+
+    results = [limiter.hit("client", START) for _ in range(41)]
+
+    assert results[:40] == [0.0] * 40
+    assert results[40] == pytest.approx(0.05)
+    assert limiter.stats() == {"allowed": 40, "rejected": 1, "keys": 1}
+
+
+def test_gcra_steady_rate_after_burst():
+    limiter = GCRALimiter(rate=10, burst=5, max_keys=10)
+    for _ in range(5):
+        assert limiter.hit("client", START) == 0
+
+    assert limiter.hit("client", START + SECOND // 20) > 0
+    assert limiter.hit("client", START + SECOND // 10) == 0
+    assert limiter.hit("client", START + SECOND // 10) > 0
+    assert limiter.hit("client", START + SECOND // 5) == 0
+
+
+def test_gcra_evicts_least_recently_seen_key():
+    limiter = GCRALimiter(rate=1, burst=1, max_keys=2)
+    limiter.hit("a", START)
+    limiter.hit("b", START)
+    limiter.hit("a", START + SECOND)
+    limiter.hit("c", START + SECOND)
+
+    assert limiter.stats()["keys"] == 2
+    assert set(limiter.drain_hits()) == {"a", "c"}
+    assert limiter.hit("a", START + SECOND) > 0
+    assert limiter.hit("b", START + SECOND) == 0
+
+
+def test_gcra_blocked_key():
+    limiter = GCRALimiter(rate=100, burst=100, max_keys=10)
+    limiter.block("client", START + SECOND)
+
+    assert limiter.hit("client", START) == pytest.approx(1.0)
+    assert limiter.hit("other", START) == 0
+    assert limiter.hit("client", START + SECOND) == 0
+    assert limiter.stats()["rejected"] == 1
+
+
+class FakePipeline:
+    def __init__(self, totals):
+        self.totals = totals
+        self.commands = []
+
+    def incrby(self, key, count):
+        self.commands.append(("incrby", key, count))
+
+    def expire(self, key, ttl):
+        self.commands.append(("expire", key, ttl))
+
+    async def execute(self):
+        results = []
+        for command, key, value in self.commands:
+            if command == "incrby":
+                self.totals[key] = self.totals.get(key, 0) + value
+                results.append(self.totals[key])
+            else:
+                results.append(True)
+        return results
+
+
+class FakeRedis:
+    """Redis stand-in holding counts already pushed by other instances"""
+
+    def __init__(self):
+        self.totals = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.totals)
+
+
+def test_sync_blocks_only_keys_over_rate_plus_burst(monkeypatch):
+    monkeypatch.setattr("time.time", lambda: 5000.0)
+    limiter = RateLimiter(rate=20, burst=40, max_keys=100, enabled=True)
+    redis = FakeRedis()
+    redis.totals["rate_limit:ip:at-limit:5000"] = 20
+    redis.totals["rate_limit:ip:over-limit:5000"] = 21
+    for key in ("at-limit", "over-limit"):
+        for _ in range(40):
+            assert limiter.limiters["ip"].hit(key) == 0
+
+    asyncio.run(limiter.sync(redis, interval=1))
+
+    assert redis.totals["rate_limit:ip:at-limit:5000"] == 60
+    assert redis.totals["rate_limit:ip:over-limit:5000"] == 61
+    assert set(limiter.limiters["ip"]._blocked) == {"over-limit"}
+    assert limiter.limiters["ip"].drain_hits() == {}
+
+
+def test_429_before_db_and_redis_dependencies(monkeypatch):
+    opened = []
+
+    async def fake_db():
+        opened.append("db")
+        yield None
+
+    async def fake_redis():
+        opened.append("redis")
+        yield None
+
+    async def fake_balance_request(video_url, db, redis_cache, client_ip=None):
+        return video_url, "origin", "segment"
+
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    monkeypatch.setattr(
+        rate_limiter,
+        "limiters",
+        {
+            "ip": GCRALimiter(rate=1, burst=2, max_keys=10),
+            "token": GCRALimiter(rate=1, burst=2, max_keys=10),
+        },
+    )
+    monkeypatch.setattr(
+        balancer_api.video_balancer, "balance_request", fake_balance_request
+    )
+
+    app = FastAPI()
+    app.include_router(balancer_api.router)
+    app.dependency_overrides[get_db] = fake_db
+    app.dependency_overrides[get_redis_client] = fake_redis
+    client = TestClient(app)
+    video = "http://s1.origin-cluster/video/1488/xcg2djHckad.ts"
+
+    statuses = [
+        client.get("/", params={"video": video}, follow_redirects=False)
+        for _ in range(3)
+    ]
+
+    assert [response.status_code for response in statuses] == [301, 301, 429]
+    assert statuses[2].headers["Retry-After"] == "1"
+    assert opened == ["db", "redis", "db", "redis"]
+    assert rate_limiter.stats()["ip"]["rejected"] == 1
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from src.app.routing import PrefixTrie, RoutingRule, RoutingTable
+
+
+CDN = RoutingRule(target="cdn", cdn_host="cdn2.example.com")
+ORIGIN = RoutingRule(target="origin")
+
+
+def brute_force_lookup(prefixes, key, width):
+    best, best_length = None, -1
+    for (prefix, length), value in prefixes.items():
+        if length > best_length and (key ^ prefix) >> (width - length) == 0:
+            best, best_length = value, length
+    return best
+
+
+@pytest.mark.parametrize("width, count", [(8, 200), (32, 2000)])
+def test_longest_prefix_match_against_brute_force(width, count):
+    rng = random.Random(width)
+    trie = PrefixTrie(width)
+    prefixes = {}
+
+    for i in range(count):
+        length = rng.randint(0, width)
+        prefix = rng.getrandbits(width) & (((1 << length) - 1) << (width - length))
+        value = f"rule-{i % 50}"
+        trie.insert(prefix, length, value)
+        prefixes[(prefix, length)] = value
+
+    assert trie.size == len(prefixes)
+    for _ in range(5000):
+        key = rng.getrandbits(width)
+        assert trie.lookup(key) == brute_force_lookup(prefixes, key, width)
+
+
+def test_lookup_ipv4_and_ipv6():
+    table = RoutingTable(
+        [("10.0.0.0/8", CDN), ("10.1.0.0/16", ORIGIN), ("2001:db8::/32", ORIGIN)]
+    )
+
+    assert table.lookup("10.1.2.3") == ORIGIN
+    assert table.lookup("10.2.3.4") == CDN
+    assert table.lookup("11.0.0.1") is None
+    assert table.lookup("2001:db8::1") == ORIGIN
+    assert table.lookup("2001:db9::1") is None
+    assert table.lookup("not-an-ip") is None
+    assert table.size == 3
+
+
+def test_ipv4_mapped_client_uses_ipv4_rules():
+    table = RoutingTable([("10.0.0.0/8", CDN)])
+
+    assert table.lookup("::ffff:10.9.9.9") == CDN
+
+
+def test_ipv4_mapped_prefix_is_stored_as_ipv4():
+    table = RoutingTable([("::ffff:0:0/96", CDN), ("::ffff:10.0.0.0/104", ORIGIN)])
+
+    assert table.lookup("10.1.1.1") == ORIGIN
+    assert table.lookup("::ffff:10.1.1.1") == ORIGIN
+    assert table.lookup("11.1.1.1") == CDN
+    assert table.size == 2
+
+
+@pytest.mark.parametrize("network", ["::/0", "::/64", "::ffff:0:0/95"])
+def test_prefix_covering_ipv4_mapped_range_is_rejected(network):
+    with pytest.raises(ValueError, match="IPv4-mapped"):
+        RoutingTable().add(network, CDN)
+
+
+def test_from_csv(tmp_path):
+    path = tmp_path / "rules.csv"
+    path.write_text(
+        "prefix,target,cdn_host\n"
+        "10.0.0.0/8,cdn,cdn2.example.com\n"
+        " 192.168.0.0/16 ,origin,\n"
+    )
+
+    table = RoutingTable.from_csv(str(path))
+
+    assert table.lookup("10.0.0.1") == CDN
+    assert table.lookup("192.168.1.1") == ORIGIN
+    assert table.size == 2
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "prefix,target,cdn_host\n10.0.0.0/8,cdn,\n10.0.0.0/33,cdn,\n",
+        "prefix,target,cdn_host\n10.0.0.0/8,cdn,\n10.1.0.0/16,mirror,\n",
+        "prefix,target,cdn_host\n10.0.0.0/8,cdn,\n10.1.0.0/16\n",
+        "prefix,cdn_host\n10.0.0.0/8,cdn2.example.com\n",
+    ],
+    ids=["bad-prefix", "bad-target", "missing-value", "missing-column"],
+)
+def test_from_csv_reports_bad_row(tmp_path, content):
+    path = tmp_path / "rules.csv"
+    path.write_text(content)
+
+    with pytest.raises(
+        ValueError, match=r"Invalid routing rule at .*rules\.csv:\d"
+    ) as e:
+        RoutingTable.from_csv(str(path))
+
+    assert e.value.__cause__ is not None